@@ -4,9 +4,11 @@ from flask_cors import CORS
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 import base64
+import json
 import requests
 import os
 import logging
+from types import MappingProxyType
 
 # ---- App init ----
 app = Flask(__name__)
@@ -38,18 +40,121 @@ def encrypt_with_ibm_key(plain_text: str) -> str:
     )
     return base64.b64encode(ciphertext).decode("utf-8")
 
+# ---- Prepared request templates (built once at startup) ----
+# Placeholders mark the only fields that vary per call; everything else is
+# serialized to JSON once and spliced back together with the per-call value.
+_MSISDN_SLOT = "\x00MSISDN\x00"
+_LOGIN_PAYLOAD_SLOT = "\x00LoginPayload\x00"
+_TRANSACTION_ID_SLOT = "\x00transactionID\x00"
+
+IBM_BASE_URL = "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog"
+
+LOGIN_HEADERS = MappingProxyType({
+    "X-IBM-Client-Id": IBM_CLIENT_ID,
+    "X-IBM-Client-Secret": IBM_CLIENT_SECRET,
+    "X-Channel": X_CHANNEL,
+    "Content-Type": "application/json",
+})
+API_HEADERS = MappingProxyType({**LOGIN_HEADERS, "accept": "application/json"})
+
+
+def prepare_body(template: dict, placeholder: str = _MSISDN_SLOT) -> tuple:
+    encoded = json.dumps(template, allow_nan=False)
+    parts = tuple(part.encode("utf-8") for part in encoded.split(json.dumps(placeholder)))
+    if len(parts) < 2:
+        raise ValueError(f"Body template has no {placeholder!r} slot: {template}")
+    return parts
+
+
+def render_body(parts: tuple, value) -> bytes:
+    # allow_nan=False matches requests' json= serialization: NaN/Infinity raise instead of going upstream.
+    return json.dumps(value, allow_nan=False).encode("utf-8").join(parts)
+
+
+def api_headers(xhash: str) -> dict:
+    return {"X-Hash-Value": xhash, **API_HEADERS}
+
+
+LOGIN_BODY = prepare_body({"LoginPayload": _LOGIN_PAYLOAD_SLOT}, _LOGIN_PAYLOAD_SLOT)
+TRANSACTION_STATUS_BODY = prepare_body({"transactionID": _TRANSACTION_ID_SLOT}, _TRANSACTION_ID_SLOT)
+
+# Fan-out run after a successful login — exact endpoints and request bodies preserved.
+IBM_FANOUT_CALLS = tuple((name, IBM_BASE_URL + path, prepare_body(body)) for name, path, body in (
+    ("MaToMATransfer", "/MaToMA/Transfer",
+     {"Amount": "10", "MSISDN": _MSISDN_SLOT, "ReceiverMSISDN": "923355923388"}),
+    ("MaToMAInquiry", "/MaToMA/Inquiry",
+     {"Amount": "20", "MSISDN": _MSISDN_SLOT, "ReceiverMSISDN": "923355923388", "cnic": "3700448243372"}),
+    ("SubscriberIBFTTransfer", "/SubscriberIBFT/Transfer", {
+        "Amount": "47",
+        "BankShortName": "MOD",
+        "BankTitle": "MOD",
+        "Branch": "00",
+        "AccountNumber": "00020000011005325",
+        "MSISDN": _MSISDN_SLOT,
+        "ReceiverMSISDN": "923332810960",
+        "ReceiverIBAN": "",
+        "SenderName": "ZEESHAN AHMED",
+        "TransactionPurpose": "0350",
+        "Username": "ZEESHAN AHMED"
+    }),
+    ("SubscriberIBFTInquiry", "/SubscriberIBFT/Inquiry", {
+        "Amount": "47",
+        "BankShortName": "MOD",
+        "BankTitle": "MOD",
+        "AccountNumber": "00020000011005325",
+        "MSISDN": _MSISDN_SLOT,
+        "ReceiverMSISDN": "923332810960",
+        "ReceiverIBAN": "923332810960",
+        "TransactionPurpose": "0350"
+    }),
+    ("MAtoCNICTransfer", "/MAtoCNIC/Transfer",
+     {"Amount": "15", "MSISDN": _MSISDN_SLOT, "ReceiverMSISDN": "923482665224", "ReceiverCNIC": "3520207345019"}),
+    ("MAtoCNICInquiry", "/MAtoCNIC/Inquiry",
+     {"Amount": "15", "MSISDN": _MSISDN_SLOT, "ReceiverMSISDN": _MSISDN_SLOT, "ReceiverCNIC": "3520207345019"}),
+    ("MaToMerchantTransfer", "/matomerchant/transfer", {
+        "Amount": "10.00",
+        "QuoteId": "1438964",
+        "MSISDN": _MSISDN_SLOT,
+        "MPOS": "923482665224",
+        "ReceiverMsisdn": "923482665224"
+    }),
+    ("MaToMerchantInquiry", "/matomerchant/inquiry", {
+        "Amount": "10.00",
+        "MSISDN": _MSISDN_SLOT,
+        "MPOS": "923482665224",
+        "ReceiverMsisdn": "923482665224"
+    }),
+    # Updated SubscriberUBPInquiry with editable MSISDN
+    ("SubscriberUBPInquiry", "/SubscriberUtilityBill/Inquiry",
+     {"ConsumerNumber": "112233", "MSISDN": _MSISDN_SLOT, "Company": "LESCO"}),
+    # Updated SubscriberUBPTransfer with editable MSISDN
+    ("SubscriberUBPTransfer", "/SubscriberUtilityBill/Payment",
+     {"Amount": "100.00", "ConsumerNumber": "01261110004080", "MSISDN": _MSISDN_SLOT, "Company": "PESCO"}),
+    # New Utility Bill Inquiry endpoint
+    ("UtilityBillInquiry", "/SubscriberUtilityBill/Inquiry",
+     {"ConsumerNumber": "112233", "MSISDN": _MSISDN_SLOT, "Company": "LESCO"}),
+    # New Utility Bill Payment endpoint
+    ("UtilityBillPayment", "/SubscriberUtilityBill/Payment",
+     {"Amount": "100.00", "ConsumerNumber": "01261110004080", "MSISDN": _MSISDN_SLOT, "Company": "PESCO"}),
+    ("AccountLimitKYC", "/accountlimit_kyc/AccountLimitKYC", {
+        "msisdn": _MSISDN_SLOT,
+        "basicinfo": "true",
+        "additionalinfo": "true",
+        "personalinfo": "true",
+        "address": "true",
+        "cnic": "true",
+        "account": "true",
+        "email": "true",
+        "aml": "true",
+        "expirydate": "true"
+    }),
+    ("AccountBalance", "/account-balance/account-bal", {"msisdn": _MSISDN_SLOT}),
+))
+
 # ---- Helper: IBM API Caller ----
-def call_ibm_api(url: str, xhash: str, body: dict):
-    headers = {
-        "X-Hash-Value": xhash,
-        "X-IBM-Client-Id": IBM_CLIENT_ID,
-        "X-IBM-Client-Secret": IBM_CLIENT_SECRET,
-        "X-Channel": X_CHANNEL,
-        "Content-Type": "application/json",
-        "accept": "application/json",
-    }
+def call_ibm_api(url: str, xhash: str, body: tuple, msisdn):
     try:
-        resp = requests.post(url, headers=headers, json=body, timeout=30)
+        resp = requests.post(url, headers=api_headers(xhash), data=render_body(body, msisdn), timeout=30)
         try:
             return resp.json()
         except Exception:
@@ -90,14 +195,10 @@ def api_encrypt():
         encrypted_value = encrypt_with_ibm_key(payload)
 
         # Corporate login
-        login_url = "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/CorporateLogin/"
-        login_headers = {
-            "X-IBM-Client-Id": IBM_CLIENT_ID,
-            "X-IBM-Client-Secret": IBM_CLIENT_SECRET,
-            "X-Channel": X_CHANNEL,
-            "Content-Type": "application/json",
-        }
-        login_resp = requests.post(login_url, headers=login_headers, json={"LoginPayload": encrypted_value}, timeout=30)
+        login_url = IBM_BASE_URL + "/CorporateLogin/"
+        login_resp = requests.post(
+            login_url, headers=LOGIN_HEADERS, data=render_body(LOGIN_BODY, encrypted_value), timeout=30
+        )
         try:
             login_result = login_resp.json()
         except Exception:
@@ -111,137 +212,8 @@ def api_encrypt():
             global_xhash = encrypt_with_ibm_key(user_ts)
             xhash = global_xhash
 
-            # Keep all API calls from your previous code — exact endpoints and request bodies preserved.
-            additional_apis["MaToMATransfer"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/MaToMA/Transfer",
-                xhash,
-                {"Amount": "10", "MSISDN": number, "ReceiverMSISDN": "923355923388"}
-            )
-
-            additional_apis["MaToMAInquiry"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/MaToMA/Inquiry",
-                xhash,
-                {"Amount": "20", "MSISDN": number, "ReceiverMSISDN": "923355923388", "cnic": "3700448243372"}
-            )
-
-            additional_apis["SubscriberIBFTTransfer"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/SubscriberIBFT/Transfer",
-                xhash,
-                {
-                    "Amount": "47",
-                    "BankShortName": "MOD",
-                    "BankTitle": "MOD",
-                    "Branch": "00",
-                    "AccountNumber": "00020000011005325",
-                    "MSISDN": number,
-                    "ReceiverMSISDN": "923332810960",
-                    "ReceiverIBAN": "",
-                    "SenderName": "ZEESHAN AHMED",
-                    "TransactionPurpose": "0350",
-                    "Username": "ZEESHAN AHMED"
-                }
-            )
-
-            additional_apis["SubscriberIBFTInquiry"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/SubscriberIBFT/Inquiry",
-                xhash,
-                {
-                    "Amount": "47",
-                    "BankShortName": "MOD",
-                    "BankTitle": "MOD",
-                    "AccountNumber": "00020000011005325",
-                    "MSISDN": number,
-                    "ReceiverMSISDN": "923332810960",
-                    "ReceiverIBAN": "923332810960",
-                    "TransactionPurpose": "0350"
-                }
-            )
-
-            additional_apis["MAtoCNICTransfer"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/MAtoCNIC/Transfer",
-                xhash,
-                {"Amount": "15", "MSISDN": number, "ReceiverMSISDN": "923482665224", "ReceiverCNIC": "3520207345019"}
-            )
-
-            additional_apis["MAtoCNICInquiry"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/MAtoCNIC/Inquiry",
-                xhash,
-                {"Amount": "15", "MSISDN": number, "ReceiverMSISDN": number, "ReceiverCNIC": "3520207345019"}
-            )
-
-            additional_apis["MaToMerchantTransfer"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/matomerchant/transfer",
-                xhash,
-                {
-                    "Amount": "10.00",
-                    "QuoteId": "1438964",
-                    "MSISDN": number,
-                    "MPOS": "923482665224",
-                    "ReceiverMsisdn": "923482665224"
-                }
-            )
-
-            additional_apis["MaToMerchantInquiry"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/matomerchant/inquiry",
-                xhash,
-                {
-                    "Amount": "10.00",
-                    "MSISDN": number,
-                    "MPOS": "923482665224",
-                    "ReceiverMsisdn": "923482665224"
-                }
-            )
-
-            # Updated SubscriberUBPInquiry with editable MSISDN
-            additional_apis["SubscriberUBPInquiry"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/SubscriberUtilityBill/Inquiry",
-                xhash,
-                {"ConsumerNumber": "112233", "MSISDN": number, "Company": "LESCO"}
-            )
-
-            # Updated SubscriberUBPTransfer with editable MSISDN
-            additional_apis["SubscriberUBPTransfer"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/SubscriberUtilityBill/Payment",
-                xhash,
-                {"Amount": "100.00", "ConsumerNumber": "01261110004080", "MSISDN": number, "Company": "PESCO"}
-            )
-
-            # New Utility Bill Inquiry endpoint
-            additional_apis["UtilityBillInquiry"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/SubscriberUtilityBill/Inquiry",
-                xhash,
-                {"ConsumerNumber": "112233", "MSISDN": number, "Company": "LESCO"}
-            )
-
-            # New Utility Bill Payment endpoint
-            additional_apis["UtilityBillPayment"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/SubscriberUtilityBill/Payment",
-                xhash,
-                {"Amount": "100.00", "ConsumerNumber": "01261110004080", "MSISDN": number, "Company": "PESCO"}
-            )
-
-            additional_apis["AccountLimitKYC"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/accountlimit_kyc/AccountLimitKYC",
-                xhash,
-                {
-                    "msisdn": number,
-                    "basicinfo": "true",
-                    "additionalinfo": "true",
-                    "personalinfo": "true",
-                    "address": "true",
-                    "cnic": "true",
-                    "account": "true",
-                    "email": "true",
-                    "aml": "true",
-                    "expirydate": "true"
-                }
-            )
-
-            additional_apis["AccountBalance"] = call_ibm_api(
-                "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/account-balance/account-bal",
-                xhash,
-                {"msisdn": number}
-            )
+            for name, url, body in IBM_FANOUT_CALLS:
+                additional_apis[name] = call_ibm_api(url, xhash, body, number)
 
         # Return everything
         return jsonify({
@@ -269,19 +241,10 @@ def inquire_transaction_status():
         if not transaction_id:
             return jsonify({"error": "transactionID is required."}), 400
 
-        url = "https://rgw.8798-f464fa20.eu-de.ri1.apiconnect.appdomain.cloud/tmfb/dev-catalog/transaction-status-inquiry/TransactionStatusInquiry"
-
-        headers = {
-            "X-Hash-Value": global_xhash,
-            "X-IBM-Client-Id": IBM_CLIENT_ID,
-            "X-IBM-Client-Secret": IBM_CLIENT_SECRET,
-            "accept": "application/json",
-            "content-type": "application/json",
-            "X-Channel": X_CHANNEL
-        }
-        payload = {"transactionID": transaction_id}
+        url = IBM_BASE_URL + "/transaction-status-inquiry/TransactionStatusInquiry"
+        payload = render_body(TRANSACTION_STATUS_BODY, transaction_id)
 
-        resp = requests.post(url, headers=headers, json=payload, timeout=30)
+        resp = requests.post(url, headers=api_headers(global_xhash), data=payload, timeout=30)
         try:
             result = resp.json()
         except Exception:
@@ -0,0 +1,139 @@
+# backend/bench_prepared_requests.py
+# Micro-benchmark: per-call CPU spent building upstream request headers/bodies
+# for the /api/encrypt fan-out, comparing the original per-call dict literals +
+# JSON serialization against the prepared templates in app.py. No network calls
+# are made.
+#
+#   python bench_prepared_requests.py [fanouts] [workers]
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import IBM_FANOUT_CALLS, IBM_CLIENT_ID, IBM_CLIENT_SECRET, X_CHANNEL, api_headers, render_body
+
+NUMBER = "923319154345"
+XHASH = "x" * 344  # base64 length of a 2048-bit RSA ciphertext
+
+
+def legacy_headers(xhash: str) -> dict:
+    # Header dict exactly as the original call_ibm_api built it.
+    return {
+        "X-Hash-Value": xhash,
+        "X-IBM-Client-Id": IBM_CLIENT_ID,
+        "X-IBM-Client-Secret": IBM_CLIENT_SECRET,
+        "X-Channel": X_CHANNEL,
+        "Content-Type": "application/json",
+        "accept": "application/json",
+    }
+
+
+def legacy_bodies(number) -> tuple:
+    # Request bodies exactly as the original api_encrypt built them, in fan-out order.
+    return (
+        {"Amount": "10", "MSISDN": number, "ReceiverMSISDN": "923355923388"},
+        {"Amount": "20", "MSISDN": number, "ReceiverMSISDN": "923355923388", "cnic": "3700448243372"},
+        {
+            "Amount": "47",
+            "BankShortName": "MOD",
+            "BankTitle": "MOD",
+            "Branch": "00",
+            "AccountNumber": "00020000011005325",
+            "MSISDN": number,
+            "ReceiverMSISDN": "923332810960",
+            "ReceiverIBAN": "",
+            "SenderName": "ZEESHAN AHMED",
+            "TransactionPurpose": "0350",
+            "Username": "ZEESHAN AHMED"
+        },
+        {
+            "Amount": "47",
+            "BankShortName": "MOD",
+            "BankTitle": "MOD",
+            "AccountNumber": "00020000011005325",
+            "MSISDN": number,
+            "ReceiverMSISDN": "923332810960",
+            "ReceiverIBAN": "923332810960",
+            "TransactionPurpose": "0350"
+        },
+        {"Amount": "15", "MSISDN": number, "ReceiverMSISDN": "923482665224", "ReceiverCNIC": "3520207345019"},
+        {"Amount": "15", "MSISDN": number, "ReceiverMSISDN": number, "ReceiverCNIC": "3520207345019"},
+        {
+            "Amount": "10.00",
+            "QuoteId": "1438964",
+            "MSISDN": number,
+            "MPOS": "923482665224",
+            "ReceiverMsisdn": "923482665224"
+        },
+        {
+            "Amount": "10.00",
+            "MSISDN": number,
+            "MPOS": "923482665224",
+            "ReceiverMsisdn": "923482665224"
+        },
+        {"ConsumerNumber": "112233", "MSISDN": number, "Company": "LESCO"},
+        {"Amount": "100.00", "ConsumerNumber": "01261110004080", "MSISDN": number, "Company": "PESCO"},
+        {"ConsumerNumber": "112233", "MSISDN": number, "Company": "LESCO"},
+        {"Amount": "100.00", "ConsumerNumber": "01261110004080", "MSISDN": number, "Company": "PESCO"},
+        {
+            "msisdn": number,
+            "basicinfo": "true",
+            "additionalinfo": "true",
+            "personalinfo": "true",
+            "address": "true",
+            "cnic": "true",
+            "account": "true",
+            "email": "true",
+            "aml": "true",
+            "expirydate": "true"
+        },
+        {"msisdn": number},
+    )
+
+
+def fanout_legacy(number, xhash: str) -> list:
+    # requests' json= serializes with json.dumps(allow_nan=False) and encodes to UTF-8.
+    return [(legacy_headers(xhash), json.dumps(body, allow_nan=False).encode("utf-8")) for body in legacy_bodies(number)]
+
+
+def fanout_prepared(number, xhash: str) -> list:
+    return [(api_headers(xhash), render_body(parts, number)) for _name, _url, parts in IBM_FANOUT_CALLS]
+
+
+def check_identical(number, xhash: str) -> None:
+    legacy = fanout_legacy(number, xhash)
+    prepared = fanout_prepared(number, xhash)
+    assert len(legacy) == len(prepared) == len(IBM_FANOUT_CALLS)
+    for (name, _url, _parts), (old_headers, old_body), (new_headers, new_body) in zip(IBM_FANOUT_CALLS, legacy, prepared):
+        assert old_headers == new_headers, f"{name}: headers differ"
+        assert old_body == new_body, f"{name}: body differs\n  old: {old_body!r}\n  new: {new_body!r}"
+
+
+def run(fn, fanouts: int, workers: int) -> float:
+    cpu = time.process_time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(lambda _: fn(NUMBER, XHASH), range(fanouts)):
+            pass
+    return time.process_time() - cpu
+
+
+if __name__ == "__main__":
+    fanouts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    for number in (NUMBER, int(NUMBER), 'ab"c\\éص'):
+        check_identical(number, XHASH)
+    for number in (float("nan"), float("inf")):
+        for _name, _url, parts in IBM_FANOUT_CALLS:
+            try:
+                render_body(parts, number)
+            except ValueError:
+                continue
+            raise AssertionError(f"{number!r} was serialized; requests' json= would have rejected it")
+
+    calls = fanouts * len(IBM_FANOUT_CALLS)
+    results = {}
+    for label, fn in (("legacy", fanout_legacy), ("prepared", fanout_prepared)):
+        results[label] = run(fn, fanouts, workers)
+        print(f"{label:>9}: {results[label]:.3f}s CPU, {results[label] / calls * 1e6:.2f}us/call")
+    saved = results["legacy"] - results["prepared"]
+    print(f"{'saved':>9}: {saved / calls * 1e6:.2f}us/call over {calls} calls ({workers} workers)")